@@ -70,9 +70,28 @@ print("ROC-AUC Score:", roc_auc_score(y_test, y_proba))
 !pip install joblib
 
 import joblib
-model=joblib.dump(rf,'agri_water_model.pkl')
+# Keep compress=0 (joblib's default): the dashboard loads the model at
+# startup, and an uncompressed pickle skips the decompression pass
+model=joblib.dump(rf,'agri_water_model.pkl', compress=0)
 print("model saved ok")
 
+"""# **Export to ONNX (optional)**"""
+
+!pip install skl2onnx
+
+from skl2onnx import convert_sklearn
+from skl2onnx.common.data_types import FloatTensorType
+
+# zipmap=False keeps probabilities as a plain [N, 2] tensor for the dashboard
+onnx_model = convert_sklearn(
+    rf,
+    initial_types=[('x', FloatTensorType([None, X_train.shape[1]]))],
+    options={id(rf): {'zipmap': False}}
+)
+with open('agri_water_model.onnx', 'wb') as f:
+    f.write(onnx_model.SerializeToString())
+print("onnx model saved ok")
+
 """# **MQTT Publisher Code**"""
 
 !pip install paho-mqtt
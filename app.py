@@ -1,3 +1,10 @@
+import os
+
+# Inference runs on a single worker thread; keep BLAS/OpenMP from starting
+# thread pools that compete with the Kivy main loop. Must precede numpy.
+for _var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+    os.environ.setdefault(_var, "1")
+
 from kivy.app import App
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.label import Label
@@ -5,19 +12,39 @@ from kivy.clock import Clock
 from kivy.uix.gridlayout import GridLayout
 from kivy.uix.scrollview import ScrollView
 from kivy.core.window import Window
-from kivy.graphics import Color, RoundedRectangle, Line, Ellipse, Rectangle
+from kivy.graphics import Color, RoundedRectangle, Line, Ellipse, Rectangle, InstructionGroup
 from kivy_garden.matplotlib.backend_kivyagg import FigureCanvasKivyAgg
 from kivy.core.text import LabelBase
 import matplotlib.pyplot as plt
 from matplotlib.figure import Figure
 import threading
+import queue
+from collections import namedtuple, OrderedDict
 import paho.mqtt.client as mqtt
-import pandas as pd
+import numpy as np
 import json
+import math
+import socket
 import time
-from collections import deque
 import joblib
-import os
+import warnings
+
+# orjson parses bytes directly and is several times faster than json
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    print("⚠️ numba not installed, falling back to sklearn predictions")
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        """No-op stand-in so @njit functions still import without numba"""
+        return lambda func: func
 
 # Register Font Awesome (download fontawesome-webfont.ttf and place in app directory)
 # Download from: https://github.com/FortAwesome/Font-Awesome/blob/fa-4/fonts/fontawesome-webfont.ttf
@@ -50,12 +77,39 @@ ICONS = {
 BROKER = "broker.hivemq.com"
 PORT = 1883
 TOPIC = "agri/sensor_data"
+# No MQTT pings: the dashboard already marks data older than 5 s as
+# disconnected, and TCP keepalive catches dead sockets (see on_connect)
+MQTT_KEEPALIVE = 0
+RECONNECT_MIN_DELAY = 0.5  # seconds, doubled after each failed attempt
+RECONNECT_MAX_DELAY = 16
+SOCKET_RCVBUF = 1 << 20  # bytes
+# Must match the publisher. "json" is readable by any subscriber of the
+# public topic; "msgpack" is opt-in and needs the msgpack package.
+PAYLOAD_FORMAT = "json"
+
+if PAYLOAD_FORMAT == "msgpack":
+    from msgpack import unpackb
+    
+    def decode_payload(payload):
+        """Decode a msgpack-encoded sensor payload"""
+        return unpackb(payload, raw=False)
+else:
+    decode_payload = json_loads
+
+# UI refresh, in seconds. The chart only redraws when a new reading arrived,
+# and redraws are blits, so it can poll more often than the cards change.
+CARD_REFRESH_INTERVAL = 1
+CHART_REFRESH_INTERVAL = 2
 
 # Load Random Forest model
 MODEL_PATH = "agri_water_model.pkl"
 try:
     if os.path.exists(MODEL_PATH):
+        # No mmap_mode: sklearn's Tree.__setstate__ copies the node arrays
+        # into its own buffers, so mapping the pickle would save nothing
         model = joblib.load(MODEL_PATH)
+        # Predict in the calling (worker) thread, no joblib thread pool
+        model.n_jobs = 1
         print(f"✅ Model loaded from {MODEL_PATH}")
     else:
         print(f"⚠️ Model file not found: {MODEL_PATH}")
@@ -64,6 +118,138 @@ except Exception as e:
     print(f"⚠️ Error loading model: {e}")
     model = None
 
+# Optional ONNX export of the same model (see agri_colab_model_code.py).
+# When present it replaces the Python-side forest for inference.
+ONNX_MODEL_PATH = "agri_water_model.onnx"
+onnx_session = None
+if model is not None and os.path.exists(ONNX_MODEL_PATH):
+    try:
+        import onnxruntime
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = 1
+        options.inter_op_num_threads = 1
+        onnx_session = onnxruntime.InferenceSession(
+            ONNX_MODEL_PATH, options, providers=["CPUExecutionProvider"])
+        ONNX_INPUT = onnx_session.get_inputs()[0].name
+        # Outputs are [label, probabilities] (exported without ZipMap); only
+        # the probabilities are fetched, the class is derived from them
+        ONNX_PROBA_OUTPUT = onnx_session.get_outputs()[1].name
+        print(f"✅ ONNX model loaded from {ONNX_MODEL_PATH}")
+    except Exception as e:
+        print(f"⚠️ Error loading ONNX model: {e}")
+        onnx_session = None
+
+# Feature order the model was trained with
+FEATURES = ('temperature_C', 'humidity_percent', 'pressure_hPa', 'soil_moisture_percent')
+if model is not None and hasattr(model, 'feature_names_in_'):
+    # Plain str keys: numpy.str_ hashes slower in the per-row dict lookups
+    FEATURES = tuple(str(name) for name in model.feature_names_in_)
+
+# The model was fitted on a DataFrame, so sklearn warns when it is fed a plain
+# array. Rows are always filled in FEATURES order, so the warning is noise.
+warnings.filterwarnings("ignore", message="X does not have valid feature names")
+
+# ---------------- Compiled Forest ----------------
+# Split thresholds are stored as int16 ranks: for feature f, a reading is
+# binned to the number of distinct f-thresholds below it, so the integer
+# compare bin <= rank gives exactly the same split as x <= threshold
+# (the histogram binning used by pygbm). The other node arrays are narrowed
+# to the smallest integer type that fits, and leaf probabilities are stored
+# as uint16 fixed point, which is exact for the pure leaves of a fully grown
+# forest; the whole forest then takes half the cache lines per descent.
+LEAF_SCALE = np.iinfo(np.uint16).max
+
+def _index_dtype(max_value):
+    """Smallest signed integer type holding 0..max_value"""
+    for dtype in (np.int8, np.int16, np.int32):
+        if max_value <= np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+def flatten_forest(forest):
+    """Stack every tree of a fitted RandomForestClassifier into flat arrays
+
+    Returns the arrays taken by rf_predict and the per-feature bin edges
+    used by quantize_features.
+    """
+    left, right, feature, threshold, leaf_proba, roots = [], [], [], [], [], []
+    offset = 0
+    for estimator in forest.estimators_:
+        tree = estimator.tree_
+        is_leaf = tree.children_left == -1
+        # Shift child indices into the stacked arrays; leaves keep -1
+        left.append(np.where(is_leaf, -1, tree.children_left + offset))
+        right.append(np.where(is_leaf, -1, tree.children_right + offset))
+        feature.append(tree.feature)
+        threshold.append(tree.threshold)
+        # Per-node class distribution -> probability of the anomaly class
+        value = tree.value[:, 0, :]
+        leaf_proba.append(value[:, 1] / value.sum(axis=1))
+        roots.append(offset)
+        offset += tree.node_count
+    
+    node_dtype = _index_dtype(offset)
+    feature = np.ascontiguousarray(np.concatenate(feature),
+                                   dtype=_index_dtype(forest.n_features_in_))
+    threshold = np.concatenate(threshold)
+    
+    rank = np.zeros(len(threshold), dtype=np.int16)
+    bin_edges = []
+    for f in range(forest.n_features_in_):
+        nodes = feature == f
+        edges = np.unique(threshold[nodes])
+        if len(edges) > np.iinfo(np.int16).max:
+            raise ValueError(f"too many thresholds for int16 on feature {f}")
+        rank[nodes] = np.searchsorted(edges, threshold[nodes])
+        bin_edges.append(edges)
+    
+    leaf_proba = np.rint(np.concatenate(leaf_proba) * LEAF_SCALE)
+    arrays = (
+        np.ascontiguousarray(np.concatenate(left), dtype=node_dtype),
+        np.ascontiguousarray(np.concatenate(right), dtype=node_dtype),
+        feature,
+        rank,
+        np.ascontiguousarray(leaf_proba, dtype=np.uint16),
+        np.asarray(roots, dtype=node_dtype),
+    )
+    return arrays, bin_edges
+
+def quantize_features(X, bin_edges, out):
+    """Bin each column of X against its feature's thresholds into out (int16)"""
+    for f, edges in enumerate(bin_edges):
+        out[:, f] = np.searchsorted(edges, X[:, f])
+    return out
+
+@njit(cache=True, fastmath=True)
+def rf_predict(Xq, left, right, feature, rank, leaf_proba, roots):
+    """Average anomaly probability over all trees for each row of binned Xq"""
+    n_trees = roots.shape[0]
+    out = np.empty(Xq.shape[0], dtype=np.float64)
+    for i in range(Xq.shape[0]):
+        # Integer sum of fixed-point leaves, scaled back once per row
+        total = 0
+        for t in range(n_trees):
+            node = roots[t]
+            while left[node] != -1:
+                if Xq[i, feature[node]] <= rank[node]:
+                    node = left[node]
+                else:
+                    node = right[node]
+            total += leaf_proba[node]
+        out[i] = total / (LEAF_SCALE * n_trees)
+    return out
+
+FOREST = None
+BIN_EDGES = None
+if (onnx_session is None and NUMBA_AVAILABLE and model is not None
+        and hasattr(model, 'estimators_')):
+    try:
+        FOREST, BIN_EDGES = flatten_forest(model)
+        print(f"✅ Compiled forest ready ({len(FOREST[-1])} trees)")
+    except Exception as e:
+        print(f"⚠️ Could not flatten model, using sklearn: {e}")
+        FOREST = None
+
 # Enhanced color palette
 COLORS = {
     'bg_dark': (0.05, 0.05, 0.08, 1),
@@ -79,99 +265,283 @@ COLORS = {
     'error': (0.96, 0.26, 0.21, 1),
     'success': (0.18, 0.80, 0.44, 1),
     'warning': (0.98, 0.74, 0.02, 1),
+    # Card backgrounds for alert states, shared by every set_color call
+    'card_ok': (0.12, 0.22, 0.15, 1),
+    'card_error': (0.25, 0.12, 0.12, 1),
+    'card_offline': (0.22, 0.12, 0.12, 1),
+    'card_warning': (0.25, 0.20, 0.10, 1),
 }
 
 # Set window background
 Window.clearcolor = COLORS['bg_dark']
 
 # Global data storage
-latest_data = {
-    "data": None,
-    "timestamp": None,
-    "connected": False,
-    "prediction": "N/A",
-    "probability": 0.0,
-    "water_needed": False,
-    "history": {
-        "temperature_C": deque(maxlen=50),
-        "humidity_percent": deque(maxlen=50),
-        "pressure_hPa": deque(maxlen=50),
-        "soil_moisture_percent": deque(maxlen=50),
-        "timestamps": deque(maxlen=50)
-    }
-}
+# The inference worker is the only writer: it replaces the single slot with a
+# fully built, immutable Snapshot, and the UI reads the slot once per tick.
+# Swapping one reference is atomic, so no lock is needed (last value wins).
+Snapshot = namedtuple('Snapshot', 'data timestamp prediction probability water_needed')
+_snapshot = [None]
+mqtt_connected = threading.Event()
+
+# Sensor history as a ring buffer, one row per channel (structure of arrays).
+# _hist_lock is held only while a column is written or the buffer is copied,
+# so the UI never sees the cursor and the data out of step.
+HISTORY_SIZE = 50
+HISTORY_KEYS = ('temperature_C', 'humidity_percent', 'pressure_hPa', 'soil_moisture_percent')
+HIST = np.zeros((len(HISTORY_KEYS), HISTORY_SIZE), dtype=np.float32)
+HIST_IDX = 0  # Total samples written; the next slot is HIST_IDX % HISTORY_SIZE
+HIST_LEN = 0  # Valid samples, at most HISTORY_SIZE
+_hist_lock = threading.Lock()
+
+def history_view():
+    """Return a copy of the history as (channels, samples), oldest sample first"""
+    with _hist_lock:
+        if HIST_LEN < HISTORY_SIZE:
+            return HIST[:, :HIST_LEN].copy()
+        idx = HIST_IDX % HISTORY_SIZE
+        if idx == 0:
+            return HIST.copy()
+        return np.concatenate((HIST[:, idx:], HIST[:, :idx]), axis=1)
 
 # Water requirement threshold
 SOIL_MOISTURE_THRESHOLD = 30.0  # Below this percentage, water is needed
+# Recommendation texts, formatted once instead of on every water card update
+WATER_NEEDED_TEXT = f"Soil moisture below {SOIL_MOISTURE_THRESHOLD}%. Irrigation recommended."
+WATER_OK_TEXT = "Soil moisture is at healthy levels. No watering needed."
+
+# ---------------- Inference Worker ----------------
+# on_message only queues the raw payload; a single worker parses it, records
+# history, runs the model and publishes snapshots, so the paho network thread
+# goes straight back to reading the socket.
+INFERENCE_BATCH_SIZE = 64
+raw_q = queue.SimpleQueue()
+_now = time.time
+
+# Preallocated feature matrix, reused for every batch instead of a DataFrame
+_X = np.empty((INFERENCE_BATCH_SIZE, len(FEATURES)), dtype=np.float32)
+_Xq = np.empty((INFERENCE_BATCH_SIZE, len(FEATURES)), dtype=np.int16)
+
+# LRU of (prediction, probability) keyed by the reading rounded to 0.1, so
+# repeated and near-repeated payloads skip the model. Worker thread only.
+PREDICTION_CACHE_SIZE = 1024
+_prediction_cache = OrderedDict()
+
+def _cache_key(data):
+    return tuple(round(data[key], 1) for key in FEATURES)
+
+# Sensors often republish an unchanged reading; the newest exact reading and
+# its result short-circuit before the rounding and LRU lookup
+_last_reading = None
+_last_result = None
+
+def _predict(batch):
+    """Predict queued (data, timestamp) readings; returns the newest result"""
+    global _last_reading, _last_result
+    data = batch[-1][0]
+    reading = tuple(data[key] for key in FEATURES)
+    if reading != _last_reading:
+        _last_result = _predict_batch(batch)
+        _last_reading = reading
+    return _last_result
+
+def _predict_batch(batch):
+    """LRU lookup for the newest reading, else one model call for the batch"""
+    newest = _cache_key(batch[-1][0])
+    cached = _prediction_cache.get(newest)
+    if cached is not None:
+        _prediction_cache.move_to_end(newest)
+        return cached
+    
+    # One model call over the distinct readings not cached yet
+    pending = {}
+    for data, _ in batch:
+        key = _cache_key(data)
+        if key not in _prediction_cache:
+            pending[key] = data
+    # The newest reading's key object as stored in pending, so the result
+    # below is found by identity rather than by recomputing the key
+    newest = key
+    for i, data in enumerate(pending.values()):
+        _X[i] = [data[key] for key in FEATURES]
+    X = _X[:len(pending)]
+    if onnx_session is not None:
+        anomaly_proba = onnx_session.run([ONNX_PROBA_OUTPUT], {ONNX_INPUT: X})[0][:, 1]
+    elif FOREST is not None:
+        Xq = quantize_features(X, BIN_EDGES, _Xq[:len(pending)])
+        anomaly_proba = rf_predict(Xq, *FOREST)
+    else:
+        # predict() is argmax(predict_proba()), so one call gives both
+        anomaly_proba = model.predict_proba(X)[:, 1]
+    
+    # Same rule as RandomForestClassifier.predict: argmax, ties go to class 0
+    results = {}
+    for key, proba in zip(pending, anomaly_proba):
+        prediction = "Anomaly" if proba > 0.5 else "Normal"
+        results[key] = (prediction, round(float(proba) * 100, 1))
+    _prediction_cache.update(results)
+    while len(_prediction_cache) > PREDICTION_CACHE_SIZE:
+        _prediction_cache.popitem(last=False)
+    
+    # The dashboard only shows the newest reading
+    return results[newest]
+
+def _ingest(payloads):
+    """Parse raw payloads into (data, timestamp) readings and record history"""
+    global HIST_IDX, HIST_LEN
+    timestamp = _now()
+    batch = []
+    for payload in payloads:
+        try:
+            raw = decode_payload(payload)
+            # Fixed payload schema; the topic is public, so anything that is
+            # not a finite number for every key is rejected here (float()
+            # alone lets "nan" and "inf" through)
+            reading = tuple(float(raw[key]) for key in HISTORY_KEYS)
+            if not all(map(math.isfinite, reading)):
+                raise ValueError(f"non-finite reading {reading}")
+        except Exception as e:
+            print("Error in MQTT:", e)
+            continue
+        data = dict(zip(HISTORY_KEYS, reading))
+        batch.append((data, timestamp))
+        
+        with _hist_lock:
+            HIST[:, HIST_IDX % HISTORY_SIZE] = reading
+            HIST_IDX += 1
+            if HIST_LEN < HISTORY_SIZE:
+                HIST_LEN += 1
+    return batch
+
+def _infer_worker():
+    """Drain queued payloads, predict them in one call and publish a snapshot"""
+    global FOREST
+    if FOREST is not None:
+        # JIT-compile before the first reading arrives. numba compiles
+        # lazily, so build or stale-cache errors only show up here.
+        try:
+            rf_predict(np.zeros((1, len(FEATURES)), dtype=np.int16), *FOREST)
+        except Exception as e:
+            print(f"⚠️ Could not compile forest, using sklearn: {e}")
+            FOREST = None
+    
+    while True:
+        payloads = [raw_q.get()]
+        # Single consumer: everything counted by qsize() is there to take, so
+        # the drain needs no queue.Empty round trip to find its end
+        for _ in range(min(raw_q.qsize(), INFERENCE_BATCH_SIZE - 1)):
+            payloads.append(raw_q.get_nowait())
+        # This is the only consumer; one bad batch must not end ingestion
+        try:
+            _process(payloads)
+        except Exception as e:
+            print(f"⚠️ Worker error, skipping batch: {e}")
+
+def _process(payloads):
+    """Ingest one drained batch, predict it and publish the snapshot"""
+    batch = _ingest(payloads)
+    if not batch:
+        return
+    
+    data, timestamp = batch[-1]
+    prediction, probability = "N/A", 0.0
+    if model is not None:
+        try:
+            prediction, probability = _predict(batch)
+        except Exception as e:
+            print(f"⚠️ Prediction error: {e}")
+            prediction, probability = "Error", 0.0
+    
+    # Check if water is needed
+    water_needed = data['soil_moisture_percent'] < SOIL_MOISTURE_THRESHOLD
+    
+    _snapshot[0] = Snapshot(data, timestamp, prediction, probability, water_needed)
+    print(f"✓ Received: Temp={data['temperature_C']}°C | Prediction: {prediction} | Water: {'NEEDED' if water_needed else 'OK'}")
 
 # ---------------- MQTT Callbacks ----------------
+def tune_broker_socket(sock):
+    """Enlarge the receive buffer and let the OS probe an idle connection"""
+    # Room for bursts between reads of the paho network loop
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_RCVBUF)
+    # TCP keepalive stands in for the disabled MQTT pings
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    # Probe timing options are not available on every platform
+    for option, value in (("TCP_KEEPIDLE", 30), ("TCP_KEEPINTVL", 10), ("TCP_KEEPCNT", 3)):
+        if hasattr(socket, option):
+            sock.setsockopt(socket.IPPROTO_TCP, getattr(socket, option), value)
+
 def on_connect(client, userdata, flags, rc):
-    global latest_data
     if rc == 0:
         print("✅ Connected to MQTT Broker!")
-        latest_data["connected"] = True
-        client.subscribe(TOPIC)
+        mqtt_connected.set()
+        try:
+            tune_broker_socket(client.socket())
+        except (OSError, AttributeError) as e:
+            print(f"⚠️ Could not tune broker socket: {e}")
+        # Telemetry: QoS 0 means no PUBACK round trip per reading
+        client.subscribe(TOPIC, qos=0)
     else:
         print("❌ Connection failed, Code:", rc)
-        latest_data["connected"] = False
+        mqtt_connected.clear()
+
+# Bound once so the per-message path is a plain call, not attribute lookups
+_queue_payload = raw_q.put
 
 def on_message(client, userdata, msg):
-    global latest_data
-    try:
-        data = json.loads(msg.payload.decode())
-        
-        latest_data["data"] = data
-        latest_data["timestamp"] = time.time()
-        
-        latest_data["history"]["temperature_C"].append(data.get('temperature_C', 0))
-        latest_data["history"]["humidity_percent"].append(data.get('humidity_percent', 0))
-        latest_data["history"]["pressure_hPa"].append(data.get('pressure_hPa', 0))
-        latest_data["history"]["soil_moisture_percent"].append(data.get('soil_moisture_percent', 0))
-        latest_data["history"]["timestamps"].append(time.strftime("%H:%M:%S"))
-        
-        # Check if water is needed
-        soil_moisture = data.get('soil_moisture_percent', 100)
-        latest_data["water_needed"] = soil_moisture < SOIL_MOISTURE_THRESHOLD
-        
-        if model is not None:
-            try:
-                df = pd.DataFrame([data])
-                prediction = model.predict(df)[0]
-                probability = model.predict_proba(df)[0]
-                
-                latest_data["prediction"] = "Anomaly" if prediction == 1 else "Normal"
-                latest_data["probability"] = round(probability[1] * 100, 1)
-            except Exception as e:
-                print(f"⚠️ Prediction error: {e}")
-                latest_data["prediction"] = "Error"
-                latest_data["probability"] = 0.0
-        
-        print(f"✓ Received: Temp={data.get('temperature_C')}°C | Prediction: {latest_data['prediction']} | Water: {'NEEDED' if latest_data['water_needed'] else 'OK'}")
-    except Exception as e:
-        print("Error in MQTT:", e)
+    _queue_payload(msg.payload)
 
 def on_disconnect(client, userdata, rc):
-    global latest_data
     print("✗ Disconnected from MQTT broker")
-    latest_data["connected"] = False
+    mqtt_connected.clear()
 
 def start_mqtt():
-    """MQTT connection in background thread"""
-    while True:
-        try:
+    """Connect to the broker on paho's own network thread
+
+    Pipeline: on_message (paho thread) -> raw_q -> _infer_worker (parse,
+    history, batched predict) -> _snapshot -> Kivy clock.
+    Returns None if the client cannot be set up; the UI then stays offline.
+    """
+    try:
+        # The callbacks use the paho 1.x signatures; 2.x needs them requested
+        if hasattr(mqtt, "CallbackAPIVersion"):
+            client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION1,
+                                 protocol=mqtt.MQTTv311)
+        else:
             client = mqtt.Client(protocol=mqtt.MQTTv311)
-            client.on_connect = on_connect
-            client.on_message = on_message
-            client.on_disconnect = on_disconnect
-            client.connect(BROKER, PORT, keepalive=60)
-            client.loop_forever()
-        except Exception as e:
-            print("Reconnecting MQTT in 5s...", e)
-            time.sleep(5)
+        client.on_connect = on_connect
+        client.on_message = on_message
+        client.on_disconnect = on_disconnect
+        # Raise paho's default of 20 unacknowledged QoS>0 messages
+        client.max_inflight_messages_set(1000)
+        # loop_start() retries the first connect and every later reconnect
+        # itself, backing off between these bounds
+        client.reconnect_delay_set(min_delay=RECONNECT_MIN_DELAY,
+                                   max_delay=RECONNECT_MAX_DELAY)
+        client.connect_async(BROKER, PORT, keepalive=MQTT_KEEPALIVE)
+        client.loop_start()
+    except Exception as e:
+        print(f"❌ Could not start MQTT client: {e}")
+        return None
+    return client
 
-threading.Thread(target=start_mqtt, daemon=True).start()
+threading.Thread(target=_infer_worker, daemon=True).start()
+# One client for the app's lifetime; reconnects reuse it and its session
+mqtt_client = start_mqtt()
 
 # ---------------- UI Components ----------------
+_STYLE_APPLIED = False
+
+def set_label(label, text=None, color=None):
+    """Assign label text/color only when they differ from what is shown"""
+    if text is not None and label.text != text:
+        label.text = text
+    if color is not None and label.color != list(color):
+        label.color = color
+
+def set_instr_color(instr, color):
+    """Update a Color instruction only when the color actually changes"""
+    if instr.rgba != list(color):
+        instr.rgba = color
+
 class ModernCard(BoxLayout):
     """Enhanced card with shadow effect"""
     def __init__(self, bg_color=None, **kwargs):
@@ -179,32 +549,52 @@ class ModernCard(BoxLayout):
         if bg_color is None:
             bg_color = COLORS['card_bg']
         
-        with self.canvas.before:
-            # Shadow effect
-            Color(0, 0, 0, 0.3)
-            self.shadow = RoundedRectangle(radius=[15])
-            # Main card
-            Color(*bg_color)
-            self.rect = RoundedRectangle(radius=[15])
+        # Shadow + main card, built once as a group; later updates only
+        # touch the instructions' attributes
+        self.shadow = RoundedRectangle(radius=[15])
+        self.bg_color_instr = Color(*bg_color)
+        self.rect = RoundedRectangle(radius=[15])
+        self.bg_group = InstructionGroup()
+        self.bg_group.add(Color(0, 0, 0, 0.3))
+        self.bg_group.add(self.shadow)
+        self.bg_group.add(self.bg_color_instr)
+        self.bg_group.add(self.rect)
+        self.canvas.before.add(self.bg_group)
         
         self.bind(pos=self.update_graphics, size=self.update_graphics)
         self.bg_color = bg_color
+        
+        # Labels whose text_size tracks their size. Size events only arm a
+        # trigger, so one layout pass syncs them all in a single callback.
+        self.wrapped_labels = []
+        self._trigger_layout_labels = Clock.create_trigger(self.layout_labels, -1)
+    
+    def wrap_labels(self, *labels):
+        """Keep text_size equal to size for these labels"""
+        self.wrapped_labels.extend(labels)
+        for label in labels:
+            label.bind(size=self._trigger_layout_labels)
+    
+    def layout_labels(self, *args):
+        for label in self.wrapped_labels:
+            label.text_size = label.size
     
     def update_graphics(self, *args):
-        self.shadow.pos = (self.pos[0] + 2, self.pos[1] - 2)
-        self.shadow.size = self.size
-        self.rect.pos = self.pos
-        self.rect.size = self.size
+        # Fires on every layout pass; read each property once
+        x, y = self.pos
+        size = self.size
+        shadow, rect = self.shadow, self.rect
+        shadow.pos = (x + 2, y - 2)
+        shadow.size = size
+        rect.pos = (x, y)
+        rect.size = size
     
     def set_color(self, color):
+        # Recolor in place; the rectangles are reused
+        if color == self.bg_color:
+            return
         self.bg_color = color
-        self.canvas.before.clear()
-        with self.canvas.before:
-            Color(0, 0, 0, 0.3)
-            self.shadow = RoundedRectangle(pos=(self.pos[0] + 2, self.pos[1] - 2), 
-                                          size=self.size, radius=[15])
-            Color(*color)
-            self.rect = RoundedRectangle(pos=self.pos, size=self.size, radius=[15])
+        self.bg_color_instr.rgba = color
 
 class IconLabel(Label):
     """Label with Font Awesome icon support"""
@@ -222,6 +612,7 @@ class SensorCard(ModernCard):
     def __init__(self, title, icon_code, unit, accent_color, **kwargs):
         super().__init__(orientation="vertical", padding=20, spacing=12, **kwargs)
         self.unit = unit
+        self._last = None  # value currently rendered
         self.accent_color = accent_color
         
         # Header with icon
@@ -241,7 +632,7 @@ class SensorCard(ModernCard):
             halign='center',
             valign='middle'
         )
-        self.icon_label.bind(size=self.icon_label.setter('text_size'))
+        self.wrap_labels(self.icon_label)
         icon_container.add_widget(self.icon_label)
         
         # Title
@@ -253,7 +644,7 @@ class SensorCard(ModernCard):
             valign='middle',
             bold=True
         )
-        title_label.bind(size=title_label.setter('text_size'))
+        self.wrap_labels(title_label)
         
         header.add_widget(icon_container)
         header.add_widget(title_label)
@@ -287,14 +678,17 @@ class SensorCard(ModernCard):
         self.icon_bg.pos = (center_x, center_y)
     
     def update_value(self, value):
-        self.value_label.text = f"{value:.1f}{self.unit}"
-        self.status_label.text = "Live Data"
-        self.status_label.color = self.accent_color
+        if value == self._last:
+            return
+        self._last = value
+        set_label(self.value_label, f"{value:.1f}{self.unit}")
+        set_label(self.status_label, "Live Data", self.accent_color)
 
 class MLPredictionCard(ModernCard):
     """AI Prediction display with enhanced styling"""
     def __init__(self, **kwargs):
         super().__init__(orientation="vertical", padding=25, spacing=18, **kwargs)
+        self._last = None  # (prediction, probability) currently rendered
         
         # Header
         header = BoxLayout(orientation='horizontal', size_hint_y=0.2, spacing=12)
@@ -314,7 +708,7 @@ class MLPredictionCard(ModernCard):
             halign='left',
             valign='middle'
         )
-        title.bind(size=title.setter('text_size'))
+        self.wrap_labels(title)
         
         header.add_widget(icon)
         header.add_widget(title)
@@ -347,7 +741,7 @@ class MLPredictionCard(ModernCard):
         # Progress bar fill
         self.progress_fill = BoxLayout(size_hint=(0, 1))
         with self.progress_fill.canvas.before:
-            Color(*COLORS['accent_blue'])
+            self.progress_fill_color = Color(*COLORS['accent_blue'])
             self.progress_fill_rect = RoundedRectangle(radius=[10])
         self.progress_fill.bind(pos=self.update_progress_fill, size=self.update_progress_fill)
         
@@ -377,7 +771,7 @@ class MLPredictionCard(ModernCard):
             halign='left',
             valign='middle'
         )
-        model_info.bind(size=model_info.setter('text_size'))
+        self.wrap_labels(model_info)
         
         model_info_box.add_widget(model_icon_label)
         model_info_box.add_widget(model_info)
@@ -396,38 +790,34 @@ class MLPredictionCard(ModernCard):
         self.progress_fill_rect.size = instance.size
     
     def update_prediction(self, prediction, probability):
+        if (prediction, probability) == self._last:
+            return
+        self._last = (prediction, probability)
         if prediction == "Anomaly":
-            self.prediction_label.text = "ANOMALY DETECTED"
-            self.prediction_label.color = COLORS['error']
-            self.set_color((0.25, 0.12, 0.12, 1))
+            set_label(self.prediction_label, "ANOMALY DETECTED", COLORS['error'])
+            self.set_color(COLORS['card_error'])
             fill_color = COLORS['error']
         elif prediction == "Normal":
-            self.prediction_label.text = "NORMAL OPERATION"
-            self.prediction_label.color = COLORS['success']
-            self.set_color((0.12, 0.22, 0.15, 1))
+            set_label(self.prediction_label, "NORMAL OPERATION", COLORS['success'])
+            self.set_color(COLORS['card_ok'])
             fill_color = COLORS['success']
         else:
-            self.prediction_label.text = prediction.upper()
-            self.prediction_label.color = COLORS['text_secondary']
+            set_label(self.prediction_label, prediction.upper(), COLORS['text_secondary'])
             fill_color = COLORS['accent_blue']
         
-        self.prob_label.text = f"Anomaly Probability: {probability}%"
+        set_label(self.prob_label, f"Anomaly Probability: {probability}%")
         
         # Update progress bar
-        self.progress_fill.size_hint_x = float(probability) / 100
-        self.progress_fill.canvas.before.clear()
-        with self.progress_fill.canvas.before:
-            Color(*fill_color)
-            self.progress_fill_rect = RoundedRectangle(
-                pos=self.progress_fill.pos,
-                size=self.progress_fill.size,
-                radius=[10]
-            )
+        fill = float(probability) / 100
+        if self.progress_fill.size_hint_x != fill:
+            self.progress_fill.size_hint_x = fill
+        set_instr_color(self.progress_fill_color, fill_color)
 
 class StatusCard(ModernCard):
     """Enhanced connection status card"""
     def __init__(self, **kwargs):
         super().__init__(orientation="vertical", padding=25, spacing=15, **kwargs)
+        self._last = None  # connection state currently rendered
         
         # Header
         header = BoxLayout(orientation='horizontal', size_hint_y=0.25, spacing=12)
@@ -447,7 +837,7 @@ class StatusCard(ModernCard):
             halign='left',
             valign='middle'
         )
-        title.bind(size=title.setter('text_size'))
+        self.wrap_labels(title)
         
         header.add_widget(self.status_icon)
         header.add_widget(title)
@@ -466,7 +856,7 @@ class StatusCard(ModernCard):
         
         self.indicator = BoxLayout(size_hint=(None, None), size=(16, 16))
         with self.indicator.canvas.before:
-            Color(*COLORS['error'])
+            self.indicator_color = Color(*COLORS['error'])
             self.indicator_circle = Ellipse(size=(16, 16))
         self.indicator.bind(pos=self.update_indicator, size=self.update_indicator)
         
@@ -477,7 +867,7 @@ class StatusCard(ModernCard):
             halign='left',
             valign='middle'
         )
-        indicator_label.bind(size=indicator_label.setter('text_size'))
+        self.wrap_labels(indicator_label)
         
         indicator_box.add_widget(self.indicator)
         indicator_box.add_widget(indicator_label)
@@ -491,7 +881,7 @@ class StatusCard(ModernCard):
             halign='center',
             valign='middle'
         )
-        self.info_label.bind(size=self.info_label.setter('text_size'))
+        self.wrap_labels(self.info_label)
         
         self.add_widget(header)
         self.add_widget(self.status_label)
@@ -502,26 +892,19 @@ class StatusCard(ModernCard):
         self.indicator_circle.pos = instance.pos
     
     def update_status(self, connected):
+        if connected == self._last:
+            return
+        self._last = connected
         if connected:
-            self.status_label.text = "CONNECTED"
-            self.status_label.color = COLORS['success']
-            self.status_icon.color = COLORS['success']
-            self.set_color((0.12, 0.22, 0.15, 1))
-            
-            self.indicator.canvas.before.clear()
-            with self.indicator.canvas.before:
-                Color(*COLORS['success'])
-                self.indicator_circle = Ellipse(pos=self.indicator.pos, size=(16, 16))
+            set_label(self.status_label, "CONNECTED", COLORS['success'])
+            set_label(self.status_icon, color=COLORS['success'])
+            self.set_color(COLORS['card_ok'])
+            set_instr_color(self.indicator_color, COLORS['success'])
         else:
-            self.status_label.text = "DISCONNECTED"
-            self.status_label.color = COLORS['error']
-            self.status_icon.color = COLORS['error']
-            self.set_color((0.22, 0.12, 0.12, 1))
-            
-            self.indicator.canvas.before.clear()
-            with self.indicator.canvas.before:
-                Color(*COLORS['error'])
-                self.indicator_circle = Ellipse(pos=self.indicator.pos, size=(16, 16))
+            set_label(self.status_label, "DISCONNECTED", COLORS['error'])
+            set_label(self.status_icon, color=COLORS['error'])
+            self.set_color(COLORS['card_offline'])
+            set_instr_color(self.indicator_color, COLORS['error'])
 
 
 class WaterAlertCard(ModernCard):
@@ -547,7 +930,7 @@ class WaterAlertCard(ModernCard):
             halign='left',
             valign='middle'
         )
-        title.bind(size=title.setter('text_size'))
+        self.wrap_labels(title)
         
         header.add_widget(self.water_icon)
         header.add_widget(title)
@@ -578,7 +961,7 @@ class WaterAlertCard(ModernCard):
             halign='center',
             valign='middle'
         )
-        self.recommendation_label.bind(size=self.recommendation_label.setter('text_size'))
+        self.wrap_labels(self.recommendation_label)
         
         self.add_widget(header)
         self.add_widget(self.status_label)
@@ -586,25 +969,37 @@ class WaterAlertCard(ModernCard):
         self.add_widget(self.recommendation_label)
     
     def update_water_status(self, water_needed, soil_moisture):
-        self.moisture_label.text = f"Soil Moisture: {soil_moisture:.1f}%"
+        set_label(self.moisture_label, f"Soil Moisture: {soil_moisture:.1f}%")
         
         if water_needed:
-            self.status_label.text = "WATER NEEDED"
-            self.status_label.color = COLORS['warning']
-            self.water_icon.color = COLORS['warning']
-            self.set_color((0.25, 0.20, 0.10, 1))
-            self.recommendation_label.text = f"Soil moisture below {SOIL_MOISTURE_THRESHOLD}%. Irrigation recommended."
-            self.recommendation_label.color = COLORS['warning']
+            set_label(self.status_label, "WATER NEEDED", COLORS['warning'])
+            set_label(self.water_icon, color=COLORS['warning'])
+            self.set_color(COLORS['card_warning'])
+            set_label(self.recommendation_label, WATER_NEEDED_TEXT, COLORS['warning'])
         else:
-            self.status_label.text = "OPTIMAL"
-            self.status_label.color = COLORS['success']
-            self.water_icon.color = COLORS['accent_blue']
-            self.set_color((0.12, 0.22, 0.15, 1))
-            self.recommendation_label.text = "Soil moisture is at healthy levels. No watering needed."
-            self.recommendation_label.color = COLORS['success']
+            set_label(self.status_label, "OPTIMAL", COLORS['success'])
+            set_label(self.water_icon, color=COLORS['accent_blue'])
+            self.set_color(COLORS['card_ok'])
+            set_label(self.recommendation_label, WATER_OK_TEXT, COLORS['success'])
+
+# Draw cost grows with points per line; longer histories are thinned to this
+CHART_MAX_POINTS = 200
+
+def _downsample(arr, n=CHART_MAX_POINTS):
+    """Every k-th sample so at most n remain, always ending on the newest"""
+    if len(arr) <= n:
+        return arr
+    step = -(-len(arr) // n)
+    return arr[(len(arr) - 1) % step::step]
 
 class LiveChartCard(ModernCard):
     """Enhanced live chart with modern styling"""
+    # History rows plotted, in line order
+    CHART_ROWS = tuple(HISTORY_KEYS.index(key) for key in
+                       ('temperature_C', 'humidity_percent', 'soil_moisture_percent'))
+    # Shared x values; each draw slices it instead of allocating a range
+    X_RANGE = np.arange(HISTORY_SIZE)
+    
     def __init__(self, **kwargs):
         super().__init__(orientation="vertical", padding=20, spacing=12, **kwargs)
         
@@ -626,26 +1021,33 @@ class LiveChartCard(ModernCard):
             halign='left',
             valign='middle'
         )
-        title.bind(size=title.setter('text_size'))
+        self.wrap_labels(title)
         
         header.add_widget(icon)
         header.add_widget(title)
         
         self.add_widget(header)
         
-        # Matplotlib chart
-        plt.style.use('dark_background')
+        # Matplotlib chart; the style is a global rcParams change, apply it once
+        global _STYLE_APPLIED
+        if not _STYLE_APPLIED:
+            plt.style.use('dark_background')
+            _STYLE_APPLIED = True
         self.figure = Figure(figsize=(12, 5), facecolor='#1a1d24')
         self.ax = self.figure.add_subplot(111, facecolor='#0d0e11')
         
         self.canvas_widget = FigureCanvasKivyAgg(self.figure)
         self.add_widget(self.canvas_widget)
         
+        # Background (axes, grid, legend) cached after every full draw
+        self._bg = None
+        self.canvas_widget.mpl_connect('draw_event', self.on_full_draw)
+        
         self.setup_plot()
     
     def setup_plot(self):
         self.ax.clear()
-        self.ax.set_xlabel('Time', color='#a5a8b0', fontsize=11, fontweight='bold')
+        self.ax.set_xlabel('Readings', color='#a5a8b0', fontsize=11, fontweight='bold')
         self.ax.set_ylabel('Values', color='#a5a8b0', fontsize=11, fontweight='bold')
         self.ax.tick_params(colors='#6b6e76', labelsize=9)
         self.ax.grid(True, alpha=0.15, color='#3a3d45', linestyle='--', linewidth=0.5)
@@ -653,47 +1055,80 @@ class LiveChartCard(ModernCard):
         self.ax.spines['right'].set_visible(False)
         self.ax.spines['left'].set_color('#3a3d45')
         self.ax.spines['bottom'].set_color('#3a3d45')
+        
+        # Temperature, humidity and soil moisture all fit a fixed range, so
+        # limits never need recomputing and ticks never change between draws
+        self.ax.set_autoscale_on(False)
+        self.ax.set_xlim(0, HISTORY_SIZE - 1)
+        self.ax.set_ylim(0, 110)
+        
+        # Lines are created once; updates only swap their data. They are
+        # animated so full draws leave them out of the cached background.
+        self.line_t, = self.ax.plot([], [], label='Temperature', color='#4285f4',
+                                    linewidth=2.5, marker='o', markersize=4,
+                                    alpha=0.9, animated=True)
+        self.line_h, = self.ax.plot([], [], label='Humidity', color='#34a853',
+                                    linewidth=2.5, marker='s', markersize=4,
+                                    alpha=0.9, animated=True)
+        self.line_s, = self.ax.plot([], [], label='Soil Moisture', color='#fbbc04',
+                                    linewidth=2.5, marker='^', markersize=4,
+                                    alpha=0.9, animated=True)
+        self.lines = (self.line_t, self.line_h, self.line_s)
+        
+        self.legend = self.ax.legend(loc='upper left', fontsize=10, 
+                                     facecolor='#1a1d24', edgecolor='#3a3d45',
+                                     framealpha=0.95)
+        for text in self.legend.get_texts():
+            text.set_color('#a5a8b0')
+    
+    def on_full_draw(self, event):
+        """Cache the static background, then paint the lines on top"""
+        self._bg = self.canvas_widget.copy_from_bbox(self.ax.bbox)
+        self.draw_lines()
+    
+    def draw_lines(self):
+        for line in self.lines:
+            self.ax.draw_artist(line)
+        # Keep the legend above the lines
+        self.ax.draw_artist(self.legend)
+    
+    def blit(self):
+        canvas = self.canvas_widget
+        canvas.restore_region(self._bg)
+        self.draw_lines()
+        # kivy-garden's blit() only records a bbox for the next full draw,
+        # so upload the updated Agg buffer into the existing texture directly.
+        # buffer_rgba() is a 3-D memoryview; blit_buffer needs flat bytes,
+        # the same conversion the garden backend's own draw() makes.
+        canvas.img_texture.blit_buffer(bytes(canvas.get_renderer().buffer_rgba()),
+                                       colorfmt='rgba', bufferfmt='ubyte')
+        canvas.canvas.ask_update()
     
     def update_chart(self, history):
+        """Plot a (channels, samples) history array from history_view()"""
         try:
-            self.ax.clear()
+            count = history.shape[1]
+            if count == 0:
+                return
             
-            if len(history["temperature_C"]) > 0:
-                x_range = range(len(history["temperature_C"]))
-                
-                # Enhanced plot styling
-                self.ax.plot(x_range, list(history["temperature_C"]), 
-                           label='Temperature', color='#4285f4', linewidth=2.5, 
-                           marker='o', markersize=4, alpha=0.9)
-                self.ax.plot(x_range, list(history["humidity_percent"]), 
-                           label='Humidity', color='#34a853', linewidth=2.5, 
-                           marker='s', markersize=4, alpha=0.9)
-                self.ax.plot(x_range, list(history["soil_moisture_percent"]), 
-                           label='Soil Moisture', color='#fbbc04', linewidth=2.5, 
-                           marker='^', markersize=4, alpha=0.9)
-                
-                # Styling
-                self.ax.set_xlabel('Readings', color='#a5a8b0', fontsize=11, fontweight='bold')
-                self.ax.set_ylabel('Values', color='#a5a8b0', fontsize=11, fontweight='bold')
-                self.ax.tick_params(colors='#6b6e76', labelsize=9)
-                self.ax.grid(True, alpha=0.15, color='#3a3d45', linestyle='--', linewidth=0.5)
-                
-                legend = self.ax.legend(loc='upper left', fontsize=10, 
-                                       facecolor='#1a1d24', edgecolor='#3a3d45',
-                                       framealpha=0.95)
-                for text in legend.get_texts():
-                    text.set_color('#a5a8b0')
-                
-                # Remove top and right spines
-                self.ax.spines['top'].set_visible(False)
-                self.ax.spines['right'].set_visible(False)
-                self.ax.spines['left'].set_color('#3a3d45')
-                self.ax.spines['bottom'].set_color('#3a3d45')
-                
-                self.ax.set_facecolor('#0d0e11')
-                self.figure.patch.set_facecolor('#1a1d24')
+            x_range = _downsample(self.X_RANGE[:count])
+            values = [_downsample(history[row]) for row in self.CHART_ROWS]
+            for line, series in zip(self.lines, values):
+                line.set_data(x_range, series)
             
-            self.canvas_widget.draw()
+            canvas = self.canvas_widget
+            # img_texture stays None until the backend's first draw
+            texture = canvas.img_texture
+            needs_full_draw = (
+                self._bg is None
+                or texture is None
+                or tuple(texture.size) != canvas.get_width_height()
+            )
+            if needs_full_draw:
+                # Draws now; the draw_event handler recaches the background
+                canvas.draw()
+            else:
+                self.blit()
         except Exception as e:
             print(f"Chart update error: {e}")
 
@@ -784,41 +1219,57 @@ class AgriDashboard(BoxLayout):
         self.chart_card = LiveChartCard(size_hint_y=0.47)
         self.add_widget(self.chart_card)
         
-        # Update interval
-        Clock.schedule_interval(self.update_dashboard, 1)
+        # Update intervals: cards are cheap, the chart redraw is not
+        # Each reading is a new Snapshot object, so an identity check on the
+        # slot tells the UI what it has not shown yet, with no flags to race
+        self._last_snap = None
+        self._last_snap_drawn = None
+        self._last_connected = None
+        Clock.schedule_interval(self.update_cards, CARD_REFRESH_INTERVAL)
+        Clock.schedule_interval(self.update_chart_if_new, CHART_REFRESH_INTERVAL)
     
     def update_header_bg(self, instance, value):
         self.header_bg.pos = instance.pos
         self.header_bg.size = instance.size
     
-    def update_dashboard(self, dt):
-        """Update all dashboard components"""
-        data = latest_data.get("data")
-        
-        if data:
-            self.temp_card.update_value(data.get('temperature_C', 0))
-            self.humid_card.update_value(data.get('humidity_percent', 0))
-            self.pressure_card.update_value(data.get('pressure_hPa', 0))
-            self.soil_card.update_value(data.get('soil_moisture_percent', 0))
-            
-            self.ml_card.update_prediction(
-                latest_data.get("prediction", "N/A"),
-                latest_data.get("probability", 0.0)
-            )
-            
-            time_since_last = time.time() - latest_data.get("timestamp", 0)
-            connected = latest_data.get("connected", False) and time_since_last < 5
-            self.status_card.update_status(connected)
-            
-            self.chart_card.update_chart(latest_data["history"])
+    def update_cards(self, dt):
+        """Update the cards when a new snapshot has arrived"""
+        snap = _snapshot[0]
+        
+        if snap is not None:
+            data = snap.data
+            if snap is not self._last_snap:
+                self._last_snap = snap
+                self.temp_card.update_value(data.get('temperature_C', 0))
+                self.humid_card.update_value(data.get('humidity_percent', 0))
+                self.pressure_card.update_value(data.get('pressure_hPa', 0))
+                self.soil_card.update_value(data.get('soil_moisture_percent', 0))
+                
+                self.ml_card.update_prediction(snap.prediction, snap.probability)
+                
+                # Update water status
+                self.water_card.update_water_status(
+                    snap.water_needed,
+                    data.get('soil_moisture_percent', 0)
+                )
             
-            # Update water status
-            self.water_card.update_water_status(
-                latest_data.get("water_needed", False),
-                data.get('soil_moisture_percent', 0)
-            )
+            time_since_last = time.time() - snap.timestamp
+            connected = mqtt_connected.is_set() and time_since_last < 5
         else:
-            self.status_card.update_status(False)
+            connected = False
+        
+        # Staleness depends on the clock, so check it every tick
+        if connected != self._last_connected:
+            self._last_connected = connected
+            self.status_card.update_status(connected)
+    
+    def update_chart_if_new(self, dt):
+        """Redraw the chart only when a new reading has arrived"""
+        snap = _snapshot[0]
+        if snap is None or snap is self._last_snap_drawn:
+            return
+        self._last_snap_drawn = snap
+        self.chart_card.update_chart(history_view())
 
 class AgriApp(App):
     def build(self):
@@ -826,14 +1277,10 @@ class AgriApp(App):
         self.title = "Smart Agriculture Dashboard"
         return AgriDashboard()
 
+    def on_stop(self):
+        if mqtt_client is not None:
+            mqtt_client.disconnect()
+            mqtt_client.loop_stop()
+
 if __name__ == "__main__":
-    # Check for required dependencies
-    try:
-        from kivy_garden.matplotlib import backend_kivyagg
-    except ImportError:
-        print("Installing kivy-garden.matplotlib...")
-        import os
-        import sys
-        os.system(f"{sys.executable} -m pip install https://github.com/kivy-garden/matplotlib/archive/master.zip")
-    
-    AgriApp().run()
\ No newline at end of file
+    AgriApp().run()
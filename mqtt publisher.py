@@ -7,6 +7,18 @@ import time
 BROKER = "broker.hivemq.com"  # public broker for testing
 PORT = 1883
 TOPIC = "agri/sensor_data"
+# Must match PAYLOAD_FORMAT in app.py. Other subscribers of the public topic
+# expect JSON, so msgpack is opt-in (and needs the msgpack package).
+PAYLOAD_FORMAT = "json"
+
+if PAYLOAD_FORMAT == "msgpack":
+    from msgpack import packb as encode_payload
+else:
+    # orjson serializes straight to bytes and is much faster than json
+    try:
+        from orjson import dumps as encode_payload
+    except ImportError:
+        encode_payload = json.dumps
 QOS = 1  # Quality of Service: 0,1,2
 
 # Function to generate dummy sensor data
@@ -30,9 +42,9 @@ try:
     # Infinite loop to send data continuously
     while True:
         sensor_data = generate_dummy_data()
-        payload = json.dumps(sensor_data)
+        payload = encode_payload(sensor_data)
         client.publish(TOPIC, payload, qos=QOS)
-        print(f"Published: {payload}")
+        print(f"Published: {sensor_data}")
         time.sleep(2)  # interval between messages
 
 except KeyboardInterrupt: